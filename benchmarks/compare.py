@@ -0,0 +1,77 @@
+"""
+Compare two benchmark reports written by `benchmarks.run` and flag regressions.
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json --threshold 0.1
+
+Exits with status 1 if any scenario regressed by more than the threshold.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+# Metric path inside a scenario report, and whether higher values are better
+METRICS: list[tuple[tuple[str, ...], bool]] = [
+    (("throughput_rps",), True),
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p95"), False),
+    (("latency_ms", "p99"), False),
+    (("db_queries_per_request",), False),
+]
+
+
+def lookup(report: dict, path: tuple[str, ...]) -> float | None:
+    for key in path:
+        if not isinstance(report, dict) or key not in report:
+            return None
+        report = report[key]
+    return report
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[str]:
+    """
+    Print a table of relative changes and return the regressed metrics.
+    """
+    regressions = []
+    for name, head_scenario in head["scenarios"].items():
+        base_scenario = base["scenarios"].get(name)
+        if base_scenario is None:
+            print(f"{name}: not in base report, skipped")
+            continue
+
+        print(name)
+        for path, higher_is_better in METRICS:
+            old = lookup(base_scenario, path)
+            new = lookup(head_scenario, path)
+            if old is None or new is None:
+                continue
+
+            change = (new - old) / old if old else 0.0
+            regressed = -change if higher_is_better else change
+            marker = "  REGRESSION" if regressed > threshold else ""
+            metric = ".".join(path)
+            print(f"  {metric:<24} {old:>12.2f} -> {new:>12.2f} ({change:+.1%}){marker}")
+            if marker:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative change considered a regression (default: 0.1 = 10%%)",
+    )
+    args = parser.parse_args()
+
+    regressions = compare(
+        json.loads(args.base.read_text()),
+        json.loads(args.head.read_text()),
+        args.threshold,
+    )
+    if regressions:
+        raise SystemExit(f"Regressions: {', '.join(regressions)}")
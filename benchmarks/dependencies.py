@@ -0,0 +1,94 @@
+"""
+Measure the per-request overhead of the payments dependency graph.
+
+Requests are sent in-process through `httpx.ASGITransport`, so there is no
+network and no database involved:
+- `baseline`: `GET /`, which has no dependencies;
+- `account_service`: `POST /account/{id}/deposit?amount=0`, which resolves the
+  full logger -> unit of work -> service chain and is rejected by validation
+  before any query is made.
+The difference between the two is the cost of building the dependency graph.
+Run it on two commits and compare the reports with `benchmarks.compare`:
+
+    uv run --project services/payments python -m benchmarks.dependencies \\
+        --output benchmarks/results/dependencies-$(git rev-parse --short HEAD).json \\
+        >/dev/null  # request logs go to stdout
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.loadgen import percentile
+from benchmarks.report import report_meta, write_report
+from payments.main import app
+
+REQUESTS = {
+    "baseline": ("GET", "/", {}),
+    "account_service": ("POST", "/account/1/deposit", {"amount": "0"}),
+}
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    params: dict[str, str],
+    *,
+    iterations: int,
+    warmup: int,
+) -> list[float]:
+    latencies = []
+    for i in range(warmup + iterations):
+        started = time.perf_counter()
+        await client.request(method, url, params=params)
+        if i >= warmup:
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def main(args: argparse.Namespace) -> None:
+    results = {}
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://payments"
+    ) as client:
+        for name, (method, url, params) in REQUESTS.items():
+            latencies = await measure(
+                client,
+                method,
+                url,
+                params,
+                iterations=args.iterations,
+                warmup=args.warmup,
+            )
+            results[name] = {
+                "requests": len(latencies),
+                "throughput_rps": len(latencies) / sum(latencies),
+                "latency_ms": {
+                    "mean": statistics.fmean(latencies) * 1000,
+                    "p50": percentile(latencies, 0.50) * 1000,
+                    "p95": percentile(latencies, 0.95) * 1000,
+                    "p99": percentile(latencies, 0.99) * 1000,
+                },
+            }
+
+    overhead = (
+        results["account_service"]["latency_ms"]["p50"]
+        - results["baseline"]["latency_ms"]["p50"]
+    )
+    results["account_service"]["dependency_overhead_ms"] = overhead
+    write_report({"meta": report_meta(), "scenarios": results}, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dependency overhead.")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write the JSON report here"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,109 @@
+"""
+Closed-loop asyncio HTTP load generator.
+
+Every worker issues one request at a time and immediately starts the next one
+once the previous has completed, until the deadline passes. After a transport
+error (connection refused, timeout) it pauses briefly first. Latencies and
+status codes of all requests are collected for the report.
+"""
+
+import asyncio
+import statistics
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+Operation = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+# Pause after a failed request, so workers do not spin against a service
+# that is down or refusing connections
+ERROR_BACKOFF = 0.1
+
+
+@dataclass
+class LoadResult:
+    """
+    Raw measurements of a single load run.
+    """
+
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter[int] = field(default_factory=Counter)
+    errors: Counter[str] = field(default_factory=Counter)
+
+    def summary(self) -> dict[str, object]:
+        """
+        Summarize the run: throughput and latency percentiles in milliseconds.
+        """
+        requests = len(self.latencies)
+        return {
+            "requests": requests,
+            "elapsed_s": self.elapsed,
+            "throughput_rps": requests / self.elapsed if self.elapsed else 0.0,
+            "successful_rps": (
+                sum(n for status, n in self.statuses.items() if status < 400)
+                / self.elapsed
+                if self.elapsed
+                else 0.0
+            ),
+            "latency_ms": {
+                "mean": statistics.fmean(self.latencies) * 1000 if requests else 0.0,
+                "p50": percentile(self.latencies, 0.50) * 1000,
+                "p95": percentile(self.latencies, 0.95) * 1000,
+                "p99": percentile(self.latencies, 0.99) * 1000,
+                "max": max(self.latencies, default=0.0) * 1000,
+            },
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+        }
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile of the given values, 0.0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    operation: Operation,
+    deadline: float,
+    result: LoadResult,
+) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await operation(client)
+        except httpx.HTTPError as e:
+            result.errors[type(e).__name__] += 1
+            await asyncio.sleep(ERROR_BACKOFF)
+            continue
+        result.latencies.append(time.perf_counter() - started)
+        result.statuses[response.status_code] += 1
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    operation: Operation,
+    *,
+    concurrency: int,
+    duration: float,
+) -> LoadResult:
+    """
+    Run `operation` from `concurrency` workers for `duration` seconds.
+    """
+    result = LoadResult()
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(
+        *(_worker(client, operation, deadline, result) for _ in range(concurrency))
+    )
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,46 @@
+"""
+Helpers shared by the benchmark scripts for machine-readable reports.
+"""
+
+import datetime
+import json
+import platform
+import subprocess
+from pathlib import Path
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report_meta(**extra: object) -> dict[str, object]:
+    """
+    Metadata identifying where and on which revision a report was produced.
+    """
+    return {
+        "git_revision": git_revision(),
+        "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **extra,
+    }
+
+
+def write_report(report: dict[str, object], output: Path | None) -> None:
+    """
+    Write the report as JSON to `output`, or to stdout if it is not given.
+    """
+    text = json.dumps(report, indent=2)
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(text + "\n")
+    else:
+        print(text)
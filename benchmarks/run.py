@@ -0,0 +1,164 @@
+"""
+Run load-test scenarios against a running payments service and write a
+machine-readable report.
+
+    uv run --project services/payments python -m benchmarks.run \\
+        --base-url http://localhost:8002 --output benchmarks/results/$(git rev-parse --short HEAD).json
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+
+from benchmarks.loadgen import run_load
+from benchmarks.report import report_meta, write_report
+from benchmarks.scenarios import SCENARIOS, Scenario
+
+
+async def service_metrics(client: httpx.AsyncClient) -> dict[str, dict[str, float]]:
+    response = await client.get("/metrics")
+    response.raise_for_status()
+    return response.json()
+
+
+def check_single_process(
+    before: dict[str, dict[str, float]], after: dict[str, dict[str, float]]
+) -> None:
+    """
+    Refuse to compare counters from different worker processes: the service
+    keeps them in memory, per worker, so deltas across workers are garbage.
+    """
+    before_process = before.pop("process", {})
+    after_process = after.pop("process", {})
+    if after_process.get("workers", 1) > 1:
+        raise SystemExit(
+            f"the service runs {after_process['workers']} workers, whose metrics "
+            "are per process; restart it with UVICORN_WORKERS=1"
+        )
+    if before_process.get("pid") != after_process.get("pid"):
+        raise SystemExit(
+            "GET /metrics was served by different processes "
+            f"({before_process.get('pid')} and {after_process.get('pid')}); "
+            "run the service with a single worker"
+        )
+
+
+def metrics_delta(
+    before: dict[str, dict[str, float]], after: dict[str, dict[str, float]]
+) -> dict[str, dict[str, float]]:
+    """
+    Difference of the numeric counters reported by `GET /metrics`.
+    """
+    return {
+        group: {
+            name: value - before.get(group, {}).get(name, 0)
+            for name, value in counters.items()
+            if isinstance(value, int)
+        }
+        for group, counters in after.items()
+        if isinstance(counters, dict)
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, args: argparse.Namespace
+) -> dict[str, object]:
+    print(f"[{scenario.name}] setting up", file=sys.stderr)
+    await scenario.setup(client)
+
+    if args.warmup:
+        print(f"[{scenario.name}] warming up", file=sys.stderr)
+        await run_load(
+            client,
+            scenario.operation,
+            concurrency=args.concurrency,
+            duration=args.warmup,
+        )
+
+    print(f"[{scenario.name}] running for {args.duration}s", file=sys.stderr)
+    before = await service_metrics(client)
+    result = await run_load(
+        client,
+        scenario.operation,
+        concurrency=args.concurrency,
+        duration=args.duration,
+    )
+    after = await service_metrics(client)
+    check_single_process(before, after)
+
+    summary = result.summary()
+    delta = metrics_delta(before, after)
+    queries = delta.get("database", {}).get("queries", 0)
+    report = {
+        "description": scenario.description,
+        "parameters": {
+            **scenario.parameters(),
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+        },
+        **summary,
+        "db_queries": queries,
+        "db_queries_per_request": queries / summary["requests"]
+        if summary["requests"]
+        else 0.0,
+        "service_metrics": delta,
+        "checks": await scenario.verify(client),
+    }
+
+    latency = summary["latency_ms"]
+    print(
+        f"[{scenario.name}] {summary['throughput_rps']:.1f} req/s, "
+        f"p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+        f"p99 {latency['p99']:.2f} ms, "
+        f"{report['db_queries_per_request']:.2f} queries/req",
+        file=sys.stderr,
+    )
+    return report
+
+
+async def main(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30
+    ) as client:
+        # Fail before any setup if the service runs several workers
+        metrics = await service_metrics(client)
+        check_single_process(dict(metrics), dict(metrics))
+
+        results = {}
+        for name in args.scenario or list(SCENARIOS):
+            scenario = SCENARIOS[name]()
+            if args.accounts:
+                scenario.accounts = args.accounts
+            results[name] = await run_scenario(client, scenario, args)
+
+    write_report(
+        {"meta": report_meta(base_url=args.base_url), "scenarios": results},
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run payments load tests.")
+    parser.add_argument("--base-url", default="http://localhost:8002")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Scenario to run; may be repeated. Runs all scenarios by default",
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument(
+        "--warmup", type=float, default=5.0, help="Warm-up seconds, not reported"
+    )
+    parser.add_argument(
+        "--accounts", type=int, default=None, help="Override the account pool size"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write the JSON report here"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,208 @@
+"""
+Load-test scenarios for the payments service.
+
+Every scenario creates its own fresh accounts in `setup`, so runs do not
+interfere with each other or with existing data, and then exercises a single
+endpoint from `operation`. Scenarios may also `verify` invariants after the
+run and report extra figures.
+"""
+
+import asyncio
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+import httpx
+
+
+async def create_accounts(
+    client: httpx.AsyncClient,
+    user_ids: list[int],
+    initial_balance: Decimal,
+    *,
+    concurrency: int = 16,
+) -> None:
+    """
+    Create accounts for the given user IDs and fund them.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create(user_id: int) -> None:
+        async with semaphore:
+            response = await client.post(f"/account/{user_id}/create_account")
+            response.raise_for_status()
+            if initial_balance:
+                response = await client.post(
+                    f"/account/{user_id}/deposit",
+                    params={"amount": str(initial_balance)},
+                )
+                response.raise_for_status()
+
+    await asyncio.gather(*(create(user_id) for user_id in user_ids))
+
+
+async def total_balance(client: httpx.AsyncClient, user_ids: list[int]) -> Decimal:
+    """
+    Sum of the balances of the given accounts.
+    """
+    total = Decimal(0)
+    for user_id in user_ids:
+        response = await client.get(f"/account/{user_id}")
+        response.raise_for_status()
+        total += Decimal(str(response.json()["balance"]))
+    return total
+
+
+@dataclass
+class Scenario(ABC):
+    """
+    Base class for scenarios. `accounts` is the size of the account pool.
+    """
+
+    name = "scenario"
+    description = ""
+
+    accounts: int = 100
+    initial_balance: Decimal = Decimal(1_000_000)
+    user_ids: list[int] = field(default_factory=list)
+
+    def parameters(self) -> dict[str, object]:
+        return {"accounts": self.accounts}
+
+    async def setup(self, client: httpx.AsyncClient) -> None:
+        first_user_id = random.randint(10**8, 2 * 10**9)
+        self.user_ids = list(range(first_user_id, first_user_id + self.accounts))
+        await create_accounts(client, self.user_ids, self.initial_balance)
+
+    @abstractmethod
+    async def operation(self, client: httpx.AsyncClient) -> httpx.Response: ...
+
+    async def verify(self, client: httpx.AsyncClient) -> dict[str, object]:
+        return {}
+
+
+@dataclass
+class BalancePolling(Scenario):
+    name = "balance_polling"
+    description = "Read-heavy: GET /account/{id} on random accounts"
+
+    async def operation(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get(f"/account/{random.choice(self.user_ids)}")
+
+
+@dataclass
+class DepositStorm(Scenario):
+    name = "deposit_storm"
+    description = "Write-heavy: POST /account/{id}/deposit on random accounts"
+
+    accounts: int = 1000
+    initial_balance: Decimal = Decimal(0)
+
+    async def operation(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post(
+            f"/account/{random.choice(self.user_ids)}/deposit",
+            params={"amount": "1.00"},
+        )
+
+
+@dataclass
+class ContendedWithdrawals(Scenario):
+    name = "contended_withdrawals"
+    description = "POST /account/{id}/withdraw on a few hot accounts"
+
+    accounts: int = 2
+
+    async def operation(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post(
+            f"/account/{random.choice(self.user_ids)}/withdraw",
+            params={"amount": "0.01"},
+        )
+
+
+@dataclass
+class TransferContention(Scenario):
+    name = "transfer_contention"
+    description = "POST /account/transfer between a few hot accounts"
+
+    accounts: int = 4
+    balance_before: Decimal = Decimal(0)
+
+    async def setup(self, client: httpx.AsyncClient) -> None:
+        await super().setup(client)
+        self.balance_before = await total_balance(client, self.user_ids)
+
+    async def operation(self, client: httpx.AsyncClient) -> httpx.Response:
+        from_user_id, to_user_id = random.sample(self.user_ids, 2)
+        return await client.post(
+            "/account/transfer",
+            params={
+                "from_user_id": from_user_id,
+                "to_user_id": to_user_id,
+                "amount": str(Decimal(random.randint(1, 1000)) / 100),
+            },
+        )
+
+    async def verify(self, client: httpx.AsyncClient) -> dict[str, object]:
+        balance_after = await total_balance(client, self.user_ids)
+        if balance_after != self.balance_before:
+            raise AssertionError(
+                f"Total balance changed from {self.balance_before} to "
+                f"{balance_after}: transfers are not atomic"
+            )
+        return {"total_balance": str(balance_after)}
+
+
+@dataclass
+class LongHistory(Scenario):
+    name = "long_history"
+    description = "GET /account/{id}/transactions on accounts with long histories"
+
+    accounts: int = 10
+    history_length: int = 5000
+    batch_size: int = 500
+    # Transfers per request, at most the service's TRANSFER_MAX_BATCH_SIZE
+    request_size: int = 100
+
+    def parameters(self) -> dict[str, object]:
+        return {**super().parameters(), "history_length": self.history_length}
+
+    async def setup(self, client: httpx.AsyncClient) -> None:
+        await super().setup(client)
+        # Every transfer adds a transaction to both accounts of the pair, so
+        # bouncing money between neighbours grows all histories evenly.
+        pairs = list(zip(self.user_ids, self.user_ids[1:] + self.user_ids[:1]))
+        for _ in range(0, self.history_length, self.batch_size):
+            transfers = [
+                {
+                    "from_user_id": from_user_id,
+                    "to_user_id": to_user_id,
+                    "amount": "0.01",
+                }
+                for from_user_id, to_user_id in pairs
+                for _ in range(self.batch_size // 2)
+            ]
+            for start in range(0, len(transfers), self.request_size):
+                response = await client.post(
+                    "/account/transfer/batch",
+                    json=transfers[start : start + self.request_size],
+                    timeout=120,
+                )
+                response.raise_for_status()
+
+    async def operation(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get(
+            f"/account/{random.choice(self.user_ids)}/transactions"
+        )
+
+
+SCENARIOS: dict[str, type[Scenario]] = {
+    scenario.name: scenario
+    for scenario in (
+        BalancePolling,
+        DepositStorm,
+        ContendedWithdrawals,
+        TransferContention,
+        LongHistory,
+    )
+}
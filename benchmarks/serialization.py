@@ -0,0 +1,123 @@
+"""
+Compare JSON serialization throughput of response models on large
+transaction lists.
+
+    uv run --project services/payments python -m benchmarks.serialization \\
+        --items 10000 --output benchmarks/results/serialization.json
+
+Candidates:
+- `fastapi_default`: what FastAPI does for an annotated endpoint with the
+  stock `JSONResponse`: validate against the response model, dump to JSON-able
+  Python objects and encode them with the stdlib `json` module.
+- `jsonable_encoder`: `jsonable_encoder` followed by the stock `JSONResponse`.
+- `pydantic_response_validated`: FastAPI's validation and dump, rendered by
+  `PydanticJSONResponse` (the service default).
+- `pydantic_response_direct`: `PydanticJSONResponse` returned by the endpoint
+  itself, skipping FastAPI's validation, as `GET /account/{id}/transactions`
+  does.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from pathlib import Path
+
+from common.responses import PydanticJSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from benchmarks.loadgen import percentile
+from benchmarks.report import report_meta, write_report
+from payments.models.account import Transaction
+
+adapter = TypeAdapter(list[Transaction])
+
+
+def fastapi_default(transactions: list[Transaction]) -> bytes:
+    content = adapter.dump_python(adapter.validate_python(transactions), mode="json")
+    return JSONResponse(content).body
+
+
+def jsonable(transactions: list[Transaction]) -> bytes:
+    return JSONResponse(jsonable_encoder(transactions)).body
+
+
+def pydantic_response_validated(transactions: list[Transaction]) -> bytes:
+    content = adapter.dump_python(adapter.validate_python(transactions), mode="json")
+    return PydanticJSONResponse(content).body
+
+
+def pydantic_response_direct(transactions: list[Transaction]) -> bytes:
+    return PydanticJSONResponse(transactions).body
+
+
+CANDIDATES: dict[str, Callable[[list[Transaction]], bytes]] = {
+    "fastapi_default": fastapi_default,
+    "jsonable_encoder": jsonable,
+    "pydantic_response_validated": pydantic_response_validated,
+    "pydantic_response_direct": pydantic_response_direct,
+}
+
+
+def make_transactions(count: int) -> list[Transaction]:
+    rng = random.Random(42)
+    return [
+        Transaction(
+            id=i,
+            account_id=1,
+            amount=Decimal(rng.randint(1, 10_000_000)).scaleb(-2),
+            description=rng.choice([None, "salary", "groceries"]),
+            direction=rng.choice(["deposit", "withdraw"]),
+        )
+        for i in range(count)
+    ]
+
+
+def main(args: argparse.Namespace) -> None:
+    transactions = make_transactions(args.items)
+    reference = CANDIDATES["fastapi_default"](transactions)
+
+    results = {}
+    for name, serialize in CANDIDATES.items():
+        if serialize(transactions) != reference:
+            raise AssertionError(f"{name} output differs from FastAPI's default")
+
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            serialize(transactions)
+            timings.append(time.perf_counter() - started)
+
+        results[name] = {
+            "items": args.items,
+            "throughput_rps": len(timings) / sum(timings),
+            "items_per_s": args.items * len(timings) / sum(timings),
+            "latency_ms": {
+                "mean": statistics.fmean(timings) * 1000,
+                "p50": percentile(timings, 0.50) * 1000,
+                "p95": percentile(timings, 0.95) * 1000,
+                "p99": percentile(timings, 0.99) * 1000,
+            },
+        }
+        print(
+            f"[{name}] {results[name]['items_per_s']:.0f} items/s, "
+            f"p50 {results[name]['latency_ms']['p50']:.2f} ms",
+            file=sys.stderr,
+        )
+
+    write_report({"meta": report_meta(), "scenarios": results}, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization.")
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write the JSON report here"
+    )
+    main(parser.parse_args())
@@ -0,0 +1,287 @@
+import time
+import zlib
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Protocol
+
+import anyio.to_thread
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, flushing it so the peer can decode it right away."""
+        ...
+
+    def finish(self) -> bytes:
+        """Return the remaining compressed data and end the stream."""
+        ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int = 6) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int = 4) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int = 3) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+# Supported encodings, in order of preference when the client accepts
+# several of them with the same quality.
+ENCODINGS: dict[str, Callable[[], Compressor]] = {
+    "zstd": ZstdCompressor,
+    "br": BrotliCompressor,
+    "gzip": GzipCompressor,
+}
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick the best supported content coding from an `Accept-Encoding` header.
+    Returns None if the response should not be compressed.
+    """
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+@dataclass
+class CompressionStats:
+    """
+    Process-wide counters of the compression middleware.
+    """
+
+    responses: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    cpu_seconds: float = 0.0
+    offloaded: int = 0
+    by_encoding: dict[str, int] = field(default_factory=dict)
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            **asdict(self),
+            "ratio": self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+        }
+
+
+compression_stats = CompressionStats()
+
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+)
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with zstd, brotli or gzip, whichever the client
+    prefers.
+
+    Responses smaller than `minimum_size` are sent as is. Streaming responses
+    are compressed chunk by chunk and flushed after every chunk. Chunks of at
+    least `offload_size` bytes are compressed in a worker thread, so big bodies
+    do not block the event loop.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 256 * 1024,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            send,
+            encoding,
+            minimum_size=self.minimum_size,
+            offload_size=self.offload_size,
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        *,
+        minimum_size: int,
+        offload_size: int,
+    ) -> None:
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+        self.start_message: Message | None = None
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+        self.offloaded = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers back until the first body chunk tells us
+            # whether the response is worth compressing.
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start_message["headers"])
+            if not self._should_compress(headers, body, more_body):
+                self.passthrough = True
+                await self._send(start_message)
+                await self._send(message)
+                return
+
+            self.compressor = ENCODINGS[self.encoding]()
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                compressed = await self._compress(body, finish=True)
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(start_message)
+                await self._send({**message, "body": compressed})
+                self._record()
+                return
+            await self._send(start_message)
+
+        compressed = await self._compress(body, finish=not more_body)
+        await self._send({**message, "body": compressed})
+        if not more_body:
+            self._record()
+
+    def _should_compress(
+        self, headers: MutableHeaders, body: bytes, more_body: bool
+    ) -> bool:
+        if "content-encoding" in headers:
+            return False
+        if not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+            return False
+        if more_body:
+            content_length = headers.get("content-length")
+            return content_length is None or int(content_length) >= self.minimum_size
+        return len(body) >= self.minimum_size
+
+    async def _compress(self, body: bytes, *, finish: bool) -> bytes:
+        if len(body) >= self.offload_size:
+            self.offloaded = True
+            return await anyio.to_thread.run_sync(self._compress_sync, body, finish)
+        return self._compress_sync(body, finish)
+
+    def _compress_sync(self, body: bytes, finish: bool) -> bytes:
+        # thread_time() is per thread, so this is correct in worker threads too
+        started = time.thread_time()
+        compressed = self.compressor.compress(body) if body else b""
+        if finish:
+            compressed += self.compressor.finish()
+        self.cpu_seconds += time.thread_time() - started
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        return compressed
+
+    def _record(self) -> None:
+        compression_stats.responses += 1
+        compression_stats.bytes_in += self.bytes_in
+        compression_stats.bytes_out += self.bytes_out
+        compression_stats.cpu_seconds += self.cpu_seconds
+        compression_stats.offloaded += self.offloaded
+        compression_stats.by_encoding[self.encoding] = (
+            compression_stats.by_encoding.get(self.encoding, 0) + 1
+        )
+        logger.debug(
+            "response_compressed",
+            encoding=self.encoding,
+            bytes_in=self.bytes_in,
+            bytes_out=self.bytes_out,
+            ratio=self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+            cpu_ms=self.cpu_seconds * 1000,
+            offloaded=self.offloaded,
+        )
@@ -0,0 +1,216 @@
+import asyncio
+import bisect
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+
+import structlog
+
+from common.logging import get_logger
+
+# Upper bounds of the lag histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+@dataclass
+class LagHistogram:
+    """
+    Non-cumulative histogram of observed event loop lags.
+    `counts[i]` is the number of observations in `(buckets[i-1], buckets[i]]`,
+    the last count holds everything above the largest bucket.
+    """
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "buckets": {
+                **{
+                    f"le_{bound}": n
+                    for bound, n in zip(self.buckets, self.counts)
+                },
+                "le_inf": self.counts[-1],
+            },
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+class LoopMonitor:
+    """
+    Watch the event loop for lag and blocking calls.
+
+    - A task sleeps for `interval` seconds in a loop and records how late it
+      wakes up in a lag histogram.
+    - A watchdog thread notices when that task has not run for longer than
+      `block_threshold` past its deadline, and logs the stack of the event loop
+      thread at that moment, i.e. the code blocking the loop.
+    - If `slow_callback_threshold` is set, every callback run by the loop is
+      timed, like asyncio debug mode does, and callbacks slower than the
+      threshold are logged. This costs two clock reads per callback and only
+      works with the default asyncio loop, not uvloop.
+
+    Start it from the application lifespan and stop it on shutdown.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = 0.1,
+        block_threshold: float = 0.25,
+        slow_callback_threshold: float | None = None,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        logger: structlog.BoundLogger | None = None,
+    ) -> None:
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.slow_callback_threshold = slow_callback_threshold
+        self.logger = logger or get_logger(__name__)
+
+        self.lag = LagHistogram(buckets=buckets)
+        self.blocked = 0
+        self.slow_callbacks = 0
+
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: int | None = None
+        self._heartbeat = 0.0
+        self._original_handle_run = None
+
+    @classmethod
+    def from_env(cls, prefix: str = "LOOP_MONITOR_") -> "LoopMonitor":
+        """
+        Create a monitor configured from `<prefix>INTERVAL`,
+        `<prefix>BLOCK_THRESHOLD` and `<prefix>SLOW_CALLBACK_THRESHOLD`
+        environment variables, in seconds.
+        """
+        kwargs = {}
+        for name in ("interval", "block_threshold", "slow_callback_threshold"):
+            value = os.environ.get(prefix + name.upper())
+            if value:
+                kwargs[name] = float(value)
+        return cls(**kwargs)
+
+    def start(self) -> None:
+        """
+        Start monitoring the running event loop.
+        """
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+
+        self._task = asyncio.get_running_loop().create_task(
+            self._sample(), name="loop-monitor"
+        )
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+        if self.slow_callback_threshold is not None:
+            self._install_callback_timer()
+
+        self.logger.info(
+            "Event loop monitor started",
+            interval=self.interval,
+            block_threshold=self.block_threshold,
+            slow_callback_threshold=self.slow_callback_threshold,
+        )
+
+    async def stop(self) -> None:
+        """
+        Stop monitoring and wait for the sampler task to finish.
+        """
+        self._stopped.set()
+        if self._original_handle_run is not None:
+            asyncio.events.Handle._run = self._original_handle_run
+            self._original_handle_run = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval + self.block_threshold)
+            self._watchdog = None
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "lag_seconds": self.lag.snapshot(),
+            "blocked": self.blocked,
+            "slow_callbacks": self.slow_callbacks,
+        }
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag.observe(max(0.0, loop.time() - expected))
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        while not self._stopped.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+
+            # Report each stall once, with the stack at the time it was noticed
+            reported_heartbeat = heartbeat
+            self.blocked += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            self.logger.warning(
+                "Event loop blocked",
+                blocked_for=blocked_for,
+                stack="".join(traceback.format_stack(frame)) if frame else None,
+            )
+
+    def _install_callback_timer(self) -> None:
+        handle_class = asyncio.events.Handle
+        original_run = handle_class._run
+        monitor = self
+
+        def _run(handle: asyncio.Handle) -> None:
+            started = time.perf_counter()
+            original_run(handle)
+            duration = time.perf_counter() - started
+            if duration >= monitor.slow_callback_threshold:
+                monitor._report_slow_callback(handle, duration)
+
+        self._original_handle_run = original_run
+        handle_class._run = _run
+
+    def _report_slow_callback(self, handle: asyncio.Handle, duration: float) -> None:
+        self.slow_callbacks += 1
+        callback = handle._callback
+        # Task steps are the usual suspects; name the coroutine they run
+        task = getattr(callback, "__self__", None)
+        if isinstance(task, asyncio.Task):
+            coro = task.get_coro()
+            name = getattr(coro, "__qualname__", repr(coro))
+        else:
+            name = getattr(callback, "__qualname__", repr(callback))
+        self.logger.warning("Slow event loop callback", callback=name, duration=duration)
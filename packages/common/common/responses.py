@@ -0,0 +1,17 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core.
+    Pydantic models and `Decimal` values (as exact strings) are serialized
+    directly in Rust, without `jsonable_encoder` and the stdlib `json` module.
+    Endpoints returning large lists can also return this response directly,
+    which skips FastAPI's validation of the return value.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
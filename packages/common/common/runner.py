@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import os
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+import uvicorn
+
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Set by `run` for the worker processes, read back by `process_info`
+WORKER_COUNT_ENV = "RUNNER_WORKER_COUNT"
+
+
+def available_cpus() -> int:
+    """
+    Number of CPUs this process may run on, taking the CPU affinity mask and
+    the cgroup v2 CPU quota (e.g. `docker run --cpus`) into account.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - not available on macOS
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, int(quota) // int(period)))
+
+
+def process_info() -> dict[str, int]:
+    """
+    Identify the serving process, for `/metrics` endpoints: counters kept in
+    memory are per worker, so readers must know which worker they talk to.
+    """
+    return {
+        "pid": os.getpid(),
+        "workers": int(os.environ.get(WORKER_COUNT_ENV, "1")),
+    }
+
+
+def _env_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class RunnerConfig:
+    """
+    Settings of the production runner. `workers=None` means one worker
+    per available CPU.
+    """
+
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int | None = None
+    graceful_timeout: float = 20.0
+    reload: bool = False
+
+    @classmethod
+    def from_env(cls, prefix: str = "UVICORN_") -> "RunnerConfig":
+        """
+        Read `<prefix>HOST`, `<prefix>PORT`, `<prefix>WORKERS`,
+        `<prefix>TIMEOUT_GRACEFUL_SHUTDOWN` and `<prefix>RELOAD`, the same
+        variables the uvicorn CLI understands. `WEB_CONCURRENCY` is honoured
+        as a fallback for the number of workers.
+        """
+        config = cls()
+        if value := os.environ.get(prefix + "HOST"):
+            config.host = value
+        if value := os.environ.get(prefix + "PORT"):
+            config.port = int(value)
+        workers = os.environ.get(prefix + "WORKERS") or os.environ.get(
+            "WEB_CONCURRENCY"
+        )
+        if workers:
+            config.workers = int(workers)
+        if value := os.environ.get(prefix + "TIMEOUT_GRACEFUL_SHUTDOWN"):
+            config.graceful_timeout = float(value)
+        if value := os.environ.get(prefix + "RELOAD"):
+            config.reload = _env_bool(value)
+        return config
+
+    @property
+    def worker_count(self) -> int:
+        if self.reload:
+            # uvicorn cannot reload a multi-process server
+            return 1
+        return self.workers or available_cpus()
+
+
+def parse_args(
+    argv: Sequence[str] | None = None, config: RunnerConfig | None = None
+) -> RunnerConfig:
+    """
+    Override the runner config, read from the environment by default,
+    with command line arguments.
+    """
+    config = config or RunnerConfig.from_env()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=config.host)
+    parser.add_argument("--port", type=int, default=config.port)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.workers,
+        help="Number of worker processes (default: one per available CPU)",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=config.graceful_timeout,
+        help="Seconds to wait for in-flight requests on shutdown",
+    )
+    parser.add_argument("--reload", action="store_true", default=config.reload)
+    args = parser.parse_args(argv)
+    return RunnerConfig(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        graceful_timeout=args.graceful_timeout,
+        reload=args.reload,
+    )
+
+
+def run(
+    app: str,
+    *,
+    setup: Callable[[], Awaitable[None]] | None = None,
+    config: RunnerConfig | None = None,
+) -> None:
+    """
+    Run the ASGI application `app` ("module:attribute") with several worker
+    processes.
+
+    `setup` runs once in the supervisor process before any worker starts, so
+    one-off work such as creating the database schema does not race between
+    workers. It must release everything it opened (e.g. dispose the engine).
+
+    Workers are spawned, not forked, so each one imports the application and
+    builds its own connection pools. On SIGTERM or SIGINT every worker stops
+    accepting connections, waits up to `graceful_timeout` seconds for
+    in-flight requests, and then runs the lifespan shutdown.
+    """
+    config = config or parse_args()
+
+    if setup is not None:
+        logger.info("Running startup tasks", app=app)
+        asyncio.run(setup())
+
+    workers = config.worker_count
+    os.environ[WORKER_COUNT_ENV] = str(workers)
+    logger.info(
+        "Starting workers",
+        app=app,
+        workers=workers,
+        host=config.host,
+        port=config.port,
+        graceful_timeout=config.graceful_timeout,
+    )
+    uvicorn.run(
+        app,
+        host=config.host,
+        port=config.port,
+        workers=workers,
+        reload=config.reload,
+        timeout_graceful_shutdown=config.graceful_timeout,
+    )
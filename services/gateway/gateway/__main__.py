@@ -0,0 +1,13 @@
+"""
+Production entry point: `python -m gateway [--workers N]`.
+"""
+
+from common.runner import run
+
+
+def main() -> None:
+    run("gateway.main:app")
+
+
+if __name__ == "__main__":
+    main()
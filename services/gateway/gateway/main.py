@@ -1,13 +1,34 @@
+from contextlib import asynccontextmanager
+from common.compression import CompressionMiddleware, compression_stats
 from common.logging import get_logger
+from common.loop_monitor import LoopMonitor
 from common.middleware import FastAPILoggingMiddleware
+from common.responses import PydanticJSONResponse
+from common.runner import process_info
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 logger = get_logger(__name__)
+loop_monitor = LoopMonitor.from_env()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Lifespan event handler for the FastAPI application.
+    """
+    logger.info("Starting Gateway Service")
+    loop_monitor.start()
+    yield
+    logger.info("Stopping Gateway Service")
+    await loop_monitor.stop()
+
 
 app = FastAPI(
     title="Gateway Service",
     description="This is the gateway service for the application.",
+    default_response_class=PydanticJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -17,6 +38,7 @@ app.add_middleware(
     allow_methods=["*"],  # Allow all methods
     allow_headers=["*"],  # Allow all headers
 )
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(FastAPILoggingMiddleware)
 
 
@@ -30,6 +52,15 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    return {
+        "compression": compression_stats.snapshot(),
+        "event_loop": loop_monitor.snapshot(),
+        "process": process_info(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
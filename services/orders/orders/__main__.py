@@ -0,0 +1,13 @@
+"""
+Production entry point: `python -m orders [--workers N]`.
+"""
+
+from common.runner import run
+
+
+def main() -> None:
+    run("orders.main:app")
+
+
+if __name__ == "__main__":
+    main()
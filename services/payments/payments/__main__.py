@@ -0,0 +1,28 @@
+"""
+Production entry point: `python -m payments [--workers N]`.
+"""
+
+import os
+
+from common.runner import run
+
+from payments.database import create_all_tables, get_engine
+
+
+async def setup() -> None:
+    """
+    Create the schema once, before the workers start.
+    """
+    engine = get_engine()
+    await create_all_tables(engine)
+    await engine.dispose()
+
+
+def main() -> None:
+    # The schema is created by `setup`, workers must not race on it
+    os.environ["CREATE_TABLES"] = "false"
+    run("payments.main:app", setup=setup)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 from functools import lru_cache
+from common.logging import get_logger
+from sqlalchemy import Connection, event, inspect, text
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs,
     async_sessionmaker,
@@ -9,14 +11,23 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from payments.config import DatabaseSettings
+from payments.metrics import query_metrics
+
+logger = get_logger(__name__)
+
+
+def _count_query(*args) -> None:
+    query_metrics.queries += 1
 
 
 @lru_cache
 def get_engine(settings: DatabaseSettings = DatabaseSettings()) -> AsyncEngine:
-    return create_async_engine(
+    engine = create_async_engine(
         settings.database_url.encoded_string(),
         echo=settings.echo,
     )
+    event.listen(engine.sync_engine, "before_cursor_execute", _count_query)
+    return engine
 
 
 @lru_cache
@@ -32,9 +43,62 @@ class Base(DeclarativeBase, AsyncAttrs):
     pass
 
 
+def _inspect_schema(conn: Connection) -> tuple[set[str], set[str], set[str]]:
+    """
+    Return the existing tables, and the columns and indexes of `transactions`.
+    """
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    if "transactions" not in tables:
+        return tables, set(), set()
+    columns = {column["name"] for column in inspector.get_columns("transactions")}
+    indexes = {index["name"] for index in inspector.get_indexes("transactions")}
+    return tables, columns, indexes
+
+
 async def create_all_tables(engine: AsyncEngine) -> None:
     """
     Create all tables in the database.
+    `create_all` never alters existing tables, so columns and indexes added
+    to existing models since are added here too, and the daily rollups are
+    backfilled from the transactions when their table is first created.
+    Everything runs in one transaction, so it is safe to run on every start.
     """
+    # Register the models, the caller may not have imported them yet
+    from payments.database import account  # noqa: F401
+    from payments.repositories.account import AccountRepository
+
     async with engine.begin() as conn:
+        tables, columns, indexes = await conn.run_sync(_inspect_schema)
         await conn.run_sync(Base.metadata.create_all)
+
+        # Only touch the table when needed: ALTER TABLE locks it exclusively
+        # even when the column already exists
+        if "transactions" in tables and "created_at" not in columns:
+            logger.info("Adding transactions.created_at")
+            await conn.execute(
+                text(
+                    "ALTER TABLE transactions ADD COLUMN IF NOT EXISTS "
+                    "created_at timestamptz NOT NULL DEFAULT now()"
+                )
+            )
+        if (
+            "transactions" in tables
+            and "ix_transactions_account_id_created_at" not in indexes
+        ):
+            logger.info("Adding ix_transactions_account_id_created_at")
+            await conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_transactions_account_id_created_at "
+                    "ON transactions (account_id, created_at)"
+                )
+            )
+
+        if "account_daily_rollups" not in tables:
+            logger.info("Backfilling daily rollups")
+            # The session joins the transaction of `conn`, its commit does not
+            # end it
+            async with AsyncSession(bind=conn) as session:
+                await AccountRepository(
+                    session=session, logger=logger
+                ).rebuild_daily_rollups()
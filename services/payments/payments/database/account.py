@@ -1,7 +1,8 @@
+from datetime import date, datetime
 from decimal import Decimal
 from . import Base
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import ForeignKey, Numeric
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, func
 
 
 class Account(Base):
@@ -12,6 +13,9 @@ class Account(Base):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_account_id_created_at", "account_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     account_id: Mapped[int] = mapped_column(
@@ -23,3 +27,30 @@ class Transaction(Base):
     )
 
     description: Mapped[str | None] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class AccountDailyRollup(Base):
+    """
+    Per-account totals of deposits and withdrawals for one UTC day.
+    Maintained by the repository in the same transaction as the writes.
+    """
+
+    __tablename__ = "account_daily_rollups"
+
+    account_id: Mapped[int] = mapped_column(
+        ForeignKey("accounts.user_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(primary_key=True)
+
+    deposits_total: Mapped[Decimal] = mapped_column(
+        Numeric(precision=14, scale=2), nullable=False, default=0
+    )
+    deposits_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    withdrawals_total: Mapped[Decimal] = mapped_column(
+        Numeric(precision=14, scale=2), nullable=False, default=0
+    )
+    withdrawals_count: Mapped[int] = mapped_column(nullable=False, default=0)
@@ -1,53 +1,42 @@
-from fastapi import Depends, Request
+from fastapi import Depends
 
-from sqlalchemy.ext.asyncio import AsyncSession
 from structlog import BoundLogger
 from payments.database import get_engine, get_session_maker
 from typing import Annotated, AsyncGenerator
 from common.logging import get_logger
+from payments.config import get_withdrawal_settings
 from uuid import uuid4
 
 from payments.uow import UOW
 from payments.services.account import AccountService
 
+_logger = get_logger(__name__)
+
 
 async def logger_dep() -> BoundLogger:
-    request_id: str = str(uuid4())
-    return get_logger(__name__).bind(
-        request_id=request_id,
-    )
+    """
+    Dependency to provide the request logger.
+    This is the only place the logger is bound; everything built for the
+    request shares it.
+    """
+    return _logger.bind(request_id=str(uuid4()))
 
 
 LoggerDep = Annotated[BoundLogger, Depends(logger_dep)]
 
 
-async def db_session_dep(logger: LoggerDep) -> AsyncGenerator[AsyncSession, None]:
-    maker = get_session_maker(get_engine())
-
-    async with maker() as session:
-        logger.debug("session_open")
-        try:
-            yield session
-        except:
-            logger.debug("session_rollback")
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
-            logger.debug("session_close")
-
-
-DBSessionDep = Annotated[AsyncSession, Depends(db_session_dep)]
-
-
-async def uow_dep(
-    session: DBSessionDep,
-    logger: LoggerDep,
-) -> UOW:
+async def uow_dep(logger: LoggerDep) -> AsyncGenerator[UOW, None]:
     """
-    Dependency to provide a Unit of Work instance with a session and logger.
+    Dependency to provide a Unit of Work instance with a lazily opened session.
     """
-    return UOW(session=session, logger=logger)
+    uow = UOW(session_maker=get_session_maker(get_engine()), logger=logger)
+    try:
+        yield uow
+    except:
+        await uow.rollback()
+        raise
+    finally:
+        await uow.close()
 
 
 UOWDep = Annotated[UOW, Depends(uow_dep)]
@@ -59,7 +48,11 @@ async def account_service_dep(
     """
     Dependency to provide an instance of AccountService.
     """
-    return AccountService(uow=uow, logger=uow.logger)
+    return AccountService(
+        uow=uow,
+        logger=uow.logger,
+        withdrawal_settings=get_withdrawal_settings(),
+    )
 
 
 AccountServiceDep = Annotated[AccountService, Depends(account_service_dep)]
@@ -1,13 +1,20 @@
 from contextlib import asynccontextmanager
+from common.compression import CompressionMiddleware, compression_stats
 from common.logging import get_logger, log_routes
+from common.loop_monitor import LoopMonitor
 from common.middleware import FastAPILoggingMiddleware
+from common.responses import PydanticJSONResponse
+from common.runner import process_info
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from payments.config import DatabaseSettings
 from payments.database import create_all_tables, get_engine
+from payments.metrics import query_metrics, transfer_metrics, withdrawal_metrics
 from payments.routers.account import router as account_router
 
 logger = get_logger(__name__)
+loop_monitor = LoopMonitor.from_env()
 
 
 @asynccontextmanager
@@ -17,17 +24,23 @@ async def lifespan(app: FastAPI):
     This is used to set up and tear down resources, such as database connections.
     """
     logger.info("Starting Payments Service")
+    loop_monitor.start()
     log_routes(app, logger=logger)  # Log the routes for debugging purposes
 
     logger.info("Setting up database connections and other resources")
-    await create_all_tables(get_engine())
+    if DatabaseSettings().create_tables:
+        await create_all_tables(get_engine())
     yield
     logger.info("Stopping Payments Service")
+    # Requests have drained by now; close the pool of this process
+    await get_engine().dispose()
+    await loop_monitor.stop()
 
 
 app = FastAPI(
     title="Payments Service",
     description="This is the payments service for the application.",
+    default_response_class=PydanticJSONResponse,
     lifespan=lifespan,
 )
 
@@ -38,6 +51,7 @@ app.add_middleware(
     allow_methods=["*"],  # Allow all methods
     allow_headers=["*"],  # Allow all headers
 )
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(FastAPILoggingMiddleware)
 
 
@@ -49,6 +63,18 @@ async def root():
     return {"message": "Welcome to the Payments Service!"}
 
 
+@app.get("/metrics")
+async def metrics():
+    return {
+        "compression": compression_stats.snapshot(),
+        "database": query_metrics.snapshot(),
+        "event_loop": loop_monitor.snapshot(),
+        "process": process_info(),
+        "transfers": transfer_metrics.snapshot(),
+        "withdrawals": withdrawal_metrics.snapshot(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
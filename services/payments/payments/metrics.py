@@ -0,0 +1,43 @@
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class RetryMetrics:
+    """
+    Process-wide counters for operations run optimistically at SERIALIZABLE
+    isolation and retried on serialization failures.
+    """
+
+    operations: int = 0
+    attempts: int = 0
+    conflicts: int = 0
+    retries: int = 0
+    exhausted: int = 0
+
+    def snapshot(self) -> dict[str, int | float]:
+        """
+        Return the counters together with the observed conflict rate.
+        """
+        return {
+            **asdict(self),
+            "conflict_rate": self.conflicts / self.attempts if self.attempts else 0.0,
+        }
+
+
+withdrawal_metrics = RetryMetrics()
+transfer_metrics = RetryMetrics()
+
+
+@dataclass
+class QueryMetrics:
+    """
+    Process-wide counter of SQL statements sent to the database.
+    """
+
+    queries: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return asdict(self)
+
+
+query_metrics = QueryMetrics()
@@ -1,3 +1,4 @@
+from datetime import date, datetime
 from decimal import Decimal
 from pydantic import BaseModel, Field
 
@@ -18,4 +19,53 @@ class Transaction(BaseModel):
     direction: str = Field(
         ..., description="Direction of the transaction (e.g., 'withdraw', 'deposit')"
     )
-    
\ No newline at end of file
+    created_at: datetime | None = Field(
+        None, description="Time the transaction was recorded"
+    )
+
+
+class TransferRequest(BaseModel):
+    from_user_id: int = Field(..., description="ID of the account to debit")
+    to_user_id: int = Field(..., description="ID of the account to credit")
+    amount: Decimal = Field(..., description="Amount to transfer")
+    description: str | None = Field(
+        None, description="Optional description of the transfer"
+    )
+
+
+class Transfer(BaseModel):
+    withdrawal: Transaction = Field(
+        ..., description="Transaction debiting the source account"
+    )
+    deposit: Transaction = Field(
+        ..., description="Transaction crediting the destination account"
+    )
+
+
+class DailyTotals(BaseModel):
+    day: date = Field(..., description="Day (UTC) the totals are for")
+    deposits: Decimal = Field(..., description="Sum of deposits on the day")
+    deposits_count: int = Field(..., description="Number of deposits on the day")
+    withdrawals: Decimal = Field(..., description="Sum of withdrawals on the day")
+    withdrawals_count: int = Field(
+        ..., description="Number of withdrawals on the day"
+    )
+
+
+class Statement(BaseModel):
+    user_id: int = Field(..., description="Unique identifier for the user")
+    from_day: date = Field(..., description="First day of the statement (UTC)")
+    to_day: date = Field(..., description="Last day of the statement (UTC)")
+    opening_balance: Decimal = Field(
+        ..., description="Balance at the start of the first day"
+    )
+    closing_balance: Decimal = Field(
+        ..., description="Balance at the end of the last day"
+    )
+    deposits: Decimal = Field(..., description="Sum of deposits over the period")
+    withdrawals: Decimal = Field(
+        ..., description="Sum of withdrawals over the period"
+    )
+    days: list[DailyTotals] = Field(
+        ..., description="Per-day totals, only for days with transactions"
+    )
@@ -1,15 +1,48 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, date, datetime
 from decimal import Decimal
-from typing import Iterable
-from venv import logger
-from sqlalchemy import select, func, text
+from typing import Iterable, Sequence, TypeVar
+from sqlalchemy import delete, insert, select, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from structlog import BoundLogger
 
-from payments.database.account import Account, Transaction
+from payments.config import WithdrawalSettings
+from payments.database.account import Account, AccountDailyRollup, Transaction
+from payments.metrics import RetryMetrics, transfer_metrics, withdrawal_metrics
 from payments.repositories.base import AbstractRepository
 
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import DBAPIError
+
+T = TypeVar("T")
+
+# SQLSTATE codes Postgres uses to abort a transaction that can be retried as is
+RETRYABLE_SQLSTATES = {"40001", "40P01"}  # serialization_failure, deadlock_detected
+
+
+class SerializationFailure(RuntimeError):
+    """
+    Raised when a serializable transaction is aborted by the database
+    and can be safely retried.
+    """
+
+
+def is_serialization_failure(error: DBAPIError) -> bool:
+    """
+    Check whether a database error is a retryable serialization failure.
+    """
+    orig = error.orig
+    for candidate in (orig, getattr(orig, "__cause__", None)):
+        if getattr(candidate, "sqlstate", None) in RETRYABLE_SQLSTATES:
+            return True
+    return False
 
 
 class AccountRepository(AbstractRepository):
+    __slots__ = ()
+
     async def get_account(self, user_id: int) -> Account | None:
         """
         Retrieve an account by user ID.
@@ -75,9 +108,13 @@ class AccountRepository(AbstractRepository):
             raise ValueError("Insufficient funds.")
 
         transaction = Transaction(
-            account_id=account_id, amount=-amount, description=description
+            account_id=account_id,
+            amount=-amount,
+            description=description,
+            created_at=datetime.now(UTC),
         )
         self.session.add(transaction)
+        await self._add_to_rollups([transaction])
         await self.session.commit()
 
         await self.session.refresh(transaction)
@@ -94,7 +131,7 @@ class AccountRepository(AbstractRepository):
         This method uses a serializable isolation level to ensure that the transaction
         is isolated from other transactions.
         If the balance is insufficient, it raises a ValueError.
-        If a serialization failure occurs, it raises a RuntimeError.
+        If a serialization failure occurs, it raises a SerializationFailure.
         """
         logger = self.logger.bind(
             account_id=account_id,
@@ -103,11 +140,8 @@ class AccountRepository(AbstractRepository):
             direction="withdraw",
         )
 
-        self.session.begin()
         try:
-            await self.session.execute(
-                text("SET TRANSACTION ISOLATION LEVEL SERIALIZABLE")
-            )
+            await self._begin_serializable()
 
             balance = await self.get_balance(account_id)
             if balance < amount:
@@ -117,13 +151,23 @@ class AccountRepository(AbstractRepository):
                 account_id=account_id,
                 amount=-amount,
                 description=description,
+                created_at=datetime.now(UTC),
             )
             self.session.add(transaction)
+            await self._add_to_rollups([transaction])
             await self.session.commit()
 
-        except OperationalError as e:
+        except ValueError:
+            await self.session.rollback()
+            logger.debug("Insufficient funds for withdrawal")
+            raise
+        except DBAPIError as e:
             await self.session.rollback()
-            raise RuntimeError("Serialization failure, retry transaction.") from e
+            if is_serialization_failure(e):
+                raise SerializationFailure(
+                    "Serialization failure, retry transaction."
+                ) from e
+            raise RuntimeError("An error occurred during the transaction.") from e
         except Exception as e:
             await self.session.rollback()
             raise RuntimeError("An error occurred during the transaction.") from e
@@ -135,6 +179,99 @@ class AccountRepository(AbstractRepository):
             )
             return transaction
 
+    async def withdraw_with_retry(
+        self,
+        account_id: int,
+        amount: Decimal,
+        description: str | None = None,
+        *,
+        settings: WithdrawalSettings,
+    ) -> Transaction:
+        """
+        Withdraw an amount from the account using the optimistic `withdraw` path,
+        retrying serialization failures with exponential backoff and full jitter.
+        Gives up and re-raises the SerializationFailure once either
+        `settings.max_attempts` or `settings.retry_budget` is exhausted.
+        """
+        logger = self.logger.bind(
+            account_id=account_id,
+            amount=amount,
+            direction="withdraw_with_retry",
+        )
+
+        return await self._retry_serializable(
+            lambda: self.withdraw(account_id, amount, description),
+            settings=settings,
+            metrics=withdrawal_metrics,
+            logger=logger,
+        )
+
+    async def _begin_serializable(self) -> None:
+        """
+        Start a transaction at SERIALIZABLE isolation.
+        """
+        if self.session.in_transaction():
+            # The isolation level can only be set before the first query of a
+            # transaction, so finish whatever the caller has read so far.
+            await self.session.commit()
+
+        await self.session.execute(
+            text("SET TRANSACTION ISOLATION LEVEL SERIALIZABLE")
+        )
+
+    async def _retry_serializable(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        *,
+        settings: WithdrawalSettings,
+        metrics: RetryMetrics,
+        logger: BoundLogger,
+    ) -> T:
+        """
+        Run `operation` until it does not raise a SerializationFailure, sleeping
+        with exponential backoff and full jitter between attempts.
+        Gives up and re-raises the SerializationFailure once either
+        `settings.max_attempts` or `settings.retry_budget` is exhausted.
+        """
+        metrics.operations += 1
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            metrics.attempts += 1
+            try:
+                return await operation()
+            except SerializationFailure:
+                metrics.conflicts += 1
+
+                delay = random.uniform(
+                    0,
+                    min(
+                        settings.backoff_max,
+                        settings.backoff_base * 2 ** (attempt - 1),
+                    ),
+                )
+                elapsed = time.monotonic() - started
+                if (
+                    attempt == settings.max_attempts
+                    or elapsed + delay > settings.retry_budget
+                ):
+                    metrics.exhausted += 1
+                    logger.warning(
+                        "Retries exhausted",
+                        attempts=attempt,
+                        elapsed=elapsed,
+                    )
+                    raise
+
+                metrics.retries += 1
+                logger.debug(
+                    "Serialization failure, retrying",
+                    attempt=attempt,
+                    delay=delay,
+                )
+                await asyncio.sleep(delay)
+
     async def deposit(
         self,
         account_id: int,
@@ -153,9 +290,13 @@ class AccountRepository(AbstractRepository):
 
         self.session.begin()
         transaction = Transaction(
-            account_id=account_id, amount=amount, description=description
+            account_id=account_id,
+            amount=amount,
+            description=description,
+            created_at=datetime.now(UTC),
         )
         self.session.add(transaction)
+        await self._add_to_rollups([transaction])
         await self.session.commit()
 
         await self.session.refresh(transaction)
@@ -163,6 +304,291 @@ class AccountRepository(AbstractRepository):
 
         return transaction
 
+    async def get_balances(self, account_ids: Iterable[int]) -> dict[int, Decimal]:
+        """
+        Retrieve the balances of several accounts in a single query.
+        Accounts without transactions are reported with a zero balance.
+        """
+        account_ids = set(account_ids)
+        result = await self.session.execute(
+            select(Transaction.account_id, func.sum(Transaction.amount))
+            .where(Transaction.account_id.in_(account_ids))
+            .group_by(Transaction.account_id)
+        )
+        balances = {account_id: Decimal(0) for account_id in account_ids}
+        balances.update(result.tuples().all())
+
+        return balances
+
+    async def get_existing_account_ids(self, user_ids: Iterable[int]) -> set[int]:
+        """
+        Return the subset of the given user IDs that have an account.
+        """
+        result = await self.session.execute(
+            select(Account.user_id).where(Account.user_id.in_(set(user_ids)))
+        )
+        return set(result.scalars().all())
+
+    async def _lock_accounts(self, account_ids: Iterable[int]) -> None:
+        """
+        Take transaction-scoped advisory locks on the given accounts.
+        Locks are always acquired in ascending account ID order, so concurrent
+        transfers touching the same accounts cannot deadlock each other.
+        This uses the same lock keys as `withdraw_with_lock`.
+        """
+        for account_id in sorted(set(account_ids)):
+            await self.session.execute(
+                text("SELECT pg_advisory_xact_lock(:lock_key)"),
+                {"lock_key": account_id},
+            )
+
+    async def transfer(
+        self,
+        from_account_id: int,
+        to_account_id: int,
+        amount: Decimal,
+        description: str | None = None,
+    ) -> tuple[Transaction, Transaction]:
+        """
+        Move an amount from one account to another in a single transaction.
+        Returns the withdrawal and the deposit legs of the transfer.
+        If the source balance is insufficient, it raises a ValueError.
+        """
+        (legs,) = await self.transfer_many(
+            [(from_account_id, to_account_id, amount, description)]
+        )
+        return legs
+
+    async def transfer_many(
+        self,
+        transfers: Sequence[tuple[int, int, Decimal, str | None]],
+        *,
+        serializable: bool = False,
+    ) -> list[tuple[Transaction, Transaction]]:
+        """
+        Apply a batch of `(from_account_id, to_account_id, amount, description)`
+        transfers atomically.
+        All involved accounts are locked up front in ascending ID order, the
+        transfers are checked in order against the running balances and both
+        legs of every transfer are written in one transaction.
+        With `serializable`, no locks are taken and the transaction runs at
+        SERIALIZABLE isolation instead, like `withdraw`, so that it is checked
+        against concurrent serializable withdrawals.
+        If any transfer would overdraw its source account, nothing is written
+        and a ValueError is raised.
+        If a serialization failure occurs, it raises a SerializationFailure.
+        """
+        logger = self.logger.bind(direction="transfer", transfers=len(transfers))
+
+        if not transfers:
+            return []
+        if any(from_id == to_id for from_id, to_id, _, _ in transfers):
+            raise ValueError("Cannot transfer to the same account.")
+
+        account_ids = {
+            account_id
+            for from_account_id, to_account_id, _, _ in transfers
+            for account_id in (from_account_id, to_account_id)
+        }
+
+        try:
+            if serializable:
+                await self._begin_serializable()
+            else:
+                await self._lock_accounts(account_ids)
+
+            balances = await self.get_balances(account_ids)
+            created_at = datetime.now(UTC)
+            legs: list[tuple[Transaction, Transaction]] = []
+            for from_account_id, to_account_id, amount, description in transfers:
+                if balances[from_account_id] < amount:
+                    logger.debug(
+                        "Insufficient funds for transfer",
+                        from_account_id=from_account_id,
+                        to_account_id=to_account_id,
+                        amount=amount,
+                    )
+                    raise ValueError("Insufficient funds.")
+
+                balances[from_account_id] -= amount
+                balances[to_account_id] += amount
+                legs.append(
+                    (
+                        Transaction(
+                            account_id=from_account_id,
+                            amount=-amount,
+                            description=description,
+                            created_at=created_at,
+                        ),
+                        Transaction(
+                            account_id=to_account_id,
+                            amount=amount,
+                            description=description,
+                            created_at=created_at,
+                        ),
+                    )
+                )
+
+            transactions = [leg for pair in legs for leg in pair]
+            self.session.add_all(transactions)
+            await self._add_to_rollups(transactions)
+            # Flushing assigns the primary keys; sessions are created with
+            # expire_on_commit=False, so no refresh is needed after the commit.
+            await self.session.flush()
+            await self.session.commit()
+
+        except ValueError:
+            await self.session.rollback()
+            raise
+        except DBAPIError as e:
+            await self.session.rollback()
+            if is_serialization_failure(e):
+                raise SerializationFailure(
+                    "Serialization failure, retry transaction."
+                ) from e
+            raise
+
+        logger.debug("Transfers completed")
+
+        return legs
+
+    async def transfer_many_with_retry(
+        self,
+        transfers: Sequence[tuple[int, int, Decimal, str | None]],
+        *,
+        settings: WithdrawalSettings,
+    ) -> list[tuple[Transaction, Transaction]]:
+        """
+        Apply a batch of transfers on the optimistic SERIALIZABLE path of
+        `transfer_many`, retrying serialization failures like
+        `withdraw_with_retry` does.
+        """
+        logger = self.logger.bind(
+            direction="transfer_with_retry", transfers=len(transfers)
+        )
+
+        return await self._retry_serializable(
+            lambda: self.transfer_many(transfers, serializable=True),
+            settings=settings,
+            metrics=transfer_metrics,
+            logger=logger,
+        )
+
+    async def _add_to_rollups(self, transactions: Iterable[Transaction]) -> None:
+        """
+        Add the given transactions to the daily rollups of their accounts.
+        Must run in the same database transaction that writes them.
+        """
+        totals: dict[tuple[int, date], dict[str, Decimal | int]] = {}
+        for transaction in transactions:
+            row = totals.setdefault(
+                (transaction.account_id, transaction.created_at.date()),
+                {
+                    "deposits_total": Decimal(0),
+                    "deposits_count": 0,
+                    "withdrawals_total": Decimal(0),
+                    "withdrawals_count": 0,
+                },
+            )
+            if transaction.amount < 0:
+                row["withdrawals_total"] -= transaction.amount
+                row["withdrawals_count"] += 1
+            else:
+                row["deposits_total"] += transaction.amount
+                row["deposits_count"] += 1
+
+        # Upsert in key order, so concurrent writers lock the rows in the same order
+        statement = pg_insert(AccountDailyRollup).values(
+            [
+                {"account_id": account_id, "day": day, **row}
+                for (account_id, day), row in sorted(totals.items())
+            ]
+        )
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[AccountDailyRollup.account_id, AccountDailyRollup.day],
+                set_={
+                    column: getattr(AccountDailyRollup, column)
+                    + getattr(statement.excluded, column)
+                    for column in (
+                        "deposits_total",
+                        "deposits_count",
+                        "withdrawals_total",
+                        "withdrawals_count",
+                    )
+                },
+            )
+        )
+
+    async def get_daily_rollups(
+        self, account_id: int, from_day: date, to_day: date
+    ) -> Sequence[AccountDailyRollup]:
+        """
+        Retrieve the daily rollups of the account between two days, inclusive.
+        Days without transactions have no rollup.
+        """
+        result = await self.session.execute(
+            select(AccountDailyRollup)
+            .where(
+                AccountDailyRollup.account_id == account_id,
+                AccountDailyRollup.day.between(from_day, to_day),
+            )
+            .order_by(AccountDailyRollup.day)
+        )
+        return result.scalars().all()
+
+    async def get_balance_before(self, account_id: int, day: date) -> Decimal:
+        """
+        Retrieve the balance of the account at the start of the given day,
+        summed from the daily rollups.
+        """
+        result = await self.session.execute(
+            select(
+                func.coalesce(
+                    func.sum(
+                        AccountDailyRollup.deposits_total
+                        - AccountDailyRollup.withdrawals_total
+                    ),
+                    0,
+                )
+            ).where(
+                AccountDailyRollup.account_id == account_id,
+                AccountDailyRollup.day < day,
+            )
+        )
+        return result.scalar_one()
+
+    async def rebuild_daily_rollups(self) -> None:
+        """
+        Recompute all daily rollups from the transactions table, e.g. after
+        bulk-loading transactions that bypassed the repository.
+        """
+        day = func.date(func.timezone("UTC", Transaction.created_at))
+        deposits = Transaction.amount >= 0
+
+        await self.session.execute(delete(AccountDailyRollup))
+        await self.session.execute(
+            insert(AccountDailyRollup).from_select(
+                [
+                    "account_id",
+                    "day",
+                    "deposits_total",
+                    "deposits_count",
+                    "withdrawals_total",
+                    "withdrawals_count",
+                ],
+                select(
+                    Transaction.account_id,
+                    day,
+                    func.coalesce(func.sum(Transaction.amount).filter(deposits), 0),
+                    func.count().filter(deposits),
+                    func.coalesce(func.sum(-Transaction.amount).filter(~deposits), 0),
+                    func.count().filter(~deposits),
+                ).group_by(Transaction.account_id, day),
+            )
+        )
+        await self.session.commit()
+
     async def get_transactions(self, account_id: int) -> Iterable[Transaction]:
         """
         Retrieve all transactions for the given account ID.
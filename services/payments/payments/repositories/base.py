@@ -1,14 +1,10 @@
-from abc import ABC, abstractmethod
+from abc import ABC
 from dataclasses import dataclass
-from venv import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 from structlog import BoundLogger
 
 
-@dataclass
+@dataclass(slots=True)
 class AbstractRepository(ABC):
     session: AsyncSession
     logger: BoundLogger
-
-    def __post_init__(self):
-        self.logger = self.logger.bind(repository=self.__class__.__name__)
@@ -1,8 +1,18 @@
-from fastapi import APIRouter
+from common.responses import PydanticJSONResponse
+from fastapi import APIRouter, Body, Query
 
 
+from datetime import date
 from decimal import Decimal
-from payments.models.account import Account, Transaction
+from typing import Annotated
+from payments.config import get_transfer_settings
+from payments.models.account import (
+    Account,
+    Statement,
+    Transaction,
+    Transfer,
+    TransferRequest,
+)
 from payments.dependencies import AccountServiceDep
 
 router = APIRouter(
@@ -11,6 +21,52 @@ router = APIRouter(
 )
 
 
+@router.post(
+    "/transfer",
+    responses={
+        400: {"description": "Insufficient funds"},
+        404: {"description": "Account not found"},
+        409: {"description": "Too many concurrent updates"},
+    },
+)
+async def transfer(
+    from_user_id: int,
+    to_user_id: int,
+    amount: Decimal,
+    account_service: AccountServiceDep,
+    description: str | None = None,
+) -> Transfer:
+    """
+    Transfer an amount from one user's account to another atomically.
+    """
+    return await account_service.transfer(
+        from_user_id, to_user_id, amount, description
+    )
+
+
+@router.post(
+    "/transfer/batch",
+    responses={
+        400: {"description": "Insufficient funds"},
+        404: {"description": "Account not found"},
+        409: {"description": "Too many concurrent updates"},
+        422: {"description": "Too many transfers in the batch"},
+    },
+)
+async def transfer_batch(
+    transfers: Annotated[
+        list[TransferRequest],
+        Body(max_length=get_transfer_settings().max_batch_size),
+    ],
+    account_service: AccountServiceDep,
+) -> list[Transfer]:
+    """
+    Apply a batch of transfers atomically: either all of them succeed or none.
+    The batch size is limited by `TRANSFER_MAX_BATCH_SIZE`.
+    """
+    return await account_service.transfer_many(transfers)
+
+
 @router.get("/{user_id}")
 async def get_account(user_id: int, account_service: AccountServiceDep) -> Account:
     """
@@ -31,7 +87,11 @@ async def deposit(
 
 
 @router.post(
-    "/{user_id}/withdraw", responses={400: {"description": "Insufficient funds"}}
+    "/{user_id}/withdraw",
+    responses={
+        400: {"description": "Insufficient funds"},
+        409: {"description": "Too many concurrent updates"},
+    },
 )
 async def withdraw(
     user_id: int, amount: Decimal, account_service: AccountServiceDep
@@ -42,14 +102,35 @@ async def withdraw(
     return await account_service.withdraw(user_id, amount)
 
 
-@router.get("/{user_id}/transactions")
+@router.get("/{user_id}/transactions", response_model=list[Transaction])
 async def get_transactions(
     user_id: int, account_service: AccountServiceDep
-) -> list[Transaction]:
+) -> PydanticJSONResponse:
     """
     Retrieve all transactions for a given user ID.
     """
-    return await account_service.get_transactions(user_id)
+    # Returned directly: the models are built by the service, so revalidating
+    # thousands of them against the response model would be wasted work.
+    return PydanticJSONResponse(await account_service.get_transactions(user_id))
+
+
+@router.get(
+    "/{user_id}/statement",
+    responses={
+        400: {"description": "Invalid period"},
+        404: {"description": "Account not found"},
+    },
+)
+async def get_statement(
+    user_id: int,
+    from_day: Annotated[date, Query(alias="from")],
+    to_day: Annotated[date, Query(alias="to")],
+    account_service: AccountServiceDep,
+) -> Statement:
+    """
+    Retrieve daily deposit and withdrawal totals for a period (UTC days, inclusive).
+    """
+    return await account_service.get_statement(user_id, from_day, to_day)
 
 
 @router.post(
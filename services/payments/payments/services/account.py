@@ -1,8 +1,20 @@
+from dataclasses import dataclass, field
+from datetime import date
 from decimal import Decimal
 from structlog import BoundLogger
-from payments.models.account import Account, Transaction
+from payments.config import WithdrawalSettings
+from payments.models.account import (
+    Account,
+    DailyTotals,
+    Statement,
+    Transaction,
+    Transfer,
+    TransferRequest,
+)
+from payments.repositories.account import SerializationFailure
 from payments.services.base import AbstractService
 from payments.database.account import Account as DBAccount
+from payments.database.account import Transaction as DBTransaction
 from fastapi import HTTPException
 from payments.uow import UOW
 
@@ -27,12 +39,43 @@ async def get_account(
     return account
 
 
+def to_transfer(withdrawal: DBTransaction, deposit: DBTransaction) -> Transfer:
+    """
+    Helper function to build the API model for both legs of a transfer.
+
+    :param withdrawal: Transaction debiting the source account.
+    :param deposit: Transaction crediting the destination account.
+    :return: Transfer model for the given legs.
+    """
+    return Transfer(
+        withdrawal=Transaction(
+            id=withdrawal.id,
+            account_id=withdrawal.account_id,
+            amount=abs(withdrawal.amount),
+            description=withdrawal.description,
+            direction="withdraw",
+            created_at=withdrawal.created_at,
+        ),
+        deposit=Transaction(
+            id=deposit.id,
+            account_id=deposit.account_id,
+            amount=deposit.amount,
+            description=deposit.description,
+            direction="deposit",
+            created_at=deposit.created_at,
+        ),
+    )
+
+
+@dataclass(slots=True)
 class AccountService(AbstractService):
     """
     Service for managing account-related operations.
     Inherits from AbstractService to ensure consistent service structure.
     """
 
+    withdrawal_settings: WithdrawalSettings = field(default_factory=WithdrawalSettings)
+
     async def get_account(self, user_id: int) -> Account:
         """
         Retrieve account information for a given user ID. If the account does not exist,
@@ -89,6 +132,7 @@ class AccountService(AbstractService):
             amount=amount,
             description=transaction.description,
             direction="deposit",
+            created_at=transaction.created_at,
         )
 
     async def withdraw(self, user_id: int, amount: Decimal) -> Transaction:
@@ -109,26 +153,128 @@ class AccountService(AbstractService):
 
         logger.info("Withdrawing amount from account")
 
-        account = await get_account(self.uow, user_id, logger)
+        await get_account(self.uow, user_id, logger)
 
         try:
-            transaction = await self.uow.account_repo.withdraw_with_lock(
-                user_id, amount
-            )
+            if self.withdrawal_settings.strategy == "serializable":
+                transaction = await self.uow.account_repo.withdraw_with_retry(
+                    user_id, amount, settings=self.withdrawal_settings
+                )
+            else:
+                transaction = await self.uow.account_repo.withdraw_with_lock(
+                    user_id, amount
+                )
         except ValueError as e:
             logger.error("Insufficient funds for withdrawal", error=str(e))
             raise HTTPException(
                 status_code=400, detail="Insufficient funds for withdrawal"
             )
+        except SerializationFailure as e:
+            logger.error("Withdrawal aborted by concurrent updates", error=str(e))
+            raise HTTPException(
+                status_code=409, detail="Too many concurrent updates, try again"
+            )
         logger.info("Withdrawal successful", transaction_id=transaction.id)
 
         return Transaction(
             id=transaction.id,
-            account_id=account.user_id,
+            account_id=user_id,
             amount=amount,
             description=transaction.description,
             direction="withdraw",
+            created_at=transaction.created_at,
+        )
+
+    async def transfer(
+        self,
+        from_user_id: int,
+        to_user_id: int,
+        amount: Decimal,
+        description: str | None = None,
+    ) -> Transfer:
+        """
+        Transfer an amount from one user's account to another atomically.
+        :param from_user_id: The ID of the user whose account is to be debited.
+        :param to_user_id: The ID of the user whose account is to be credited.
+        :param amount: The amount to be transferred.
+        :param description: Optional description stored on both legs.
+        :return: Both transactions of the transfer.
+        """
+        (transfer,) = await self.transfer_many(
+            [
+                TransferRequest(
+                    from_user_id=from_user_id,
+                    to_user_id=to_user_id,
+                    amount=amount,
+                    description=description,
+                )
+            ]
         )
+        return transfer
+
+    async def transfer_many(self, transfers: list[TransferRequest]) -> list[Transfer]:
+        """
+        Apply a batch of transfers atomically: either all of them succeed or none.
+        :param transfers: Transfers to apply, in order.
+        :return: Both transactions of every transfer, in the same order.
+        """
+        logger = self.logger.bind(transfers=len(transfers), action="transfer")
+
+        for transfer in transfers:
+            if transfer.amount <= 0:
+                logger.error("Transfer amount must be positive")
+                raise HTTPException(
+                    status_code=400, detail="Transfer amount must be positive"
+                )
+            if transfer.from_user_id == transfer.to_user_id:
+                logger.error("Cannot transfer to the same account")
+                raise HTTPException(
+                    status_code=400, detail="Cannot transfer to the same account"
+                )
+
+        user_ids = {
+            user_id
+            for transfer in transfers
+            for user_id in (transfer.from_user_id, transfer.to_user_id)
+        }
+        existing = await self.uow.account_repo.get_existing_account_ids(user_ids)
+        if missing := user_ids - existing:
+            logger.info("Account not found", user_ids=sorted(missing))
+            raise HTTPException(status_code=404, detail="Account not found")
+
+        logger.info("Transferring amounts between accounts")
+
+        batch = [
+            (
+                transfer.from_user_id,
+                transfer.to_user_id,
+                transfer.amount,
+                transfer.description,
+            )
+            for transfer in transfers
+        ]
+        try:
+            if self.withdrawal_settings.strategy == "serializable":
+                # Serializable withdrawals take no locks, so transfers have to
+                # run at SERIALIZABLE too for Postgres to detect their conflicts.
+                legs = await self.uow.account_repo.transfer_many_with_retry(
+                    batch, settings=self.withdrawal_settings
+                )
+            else:
+                legs = await self.uow.account_repo.transfer_many(batch)
+        except ValueError as e:
+            logger.error("Insufficient funds for transfer", error=str(e))
+            raise HTTPException(
+                status_code=400, detail="Insufficient funds for transfer"
+            )
+        except SerializationFailure as e:
+            logger.error("Transfer aborted by concurrent updates", error=str(e))
+            raise HTTPException(
+                status_code=409, detail="Too many concurrent updates, try again"
+            )
+        logger.info("Transfer successful")
+
+        return [to_transfer(withdrawal, deposit) for withdrawal, deposit in legs]
 
     async def get_transactions(self, user_id: int) -> list[Transaction]:
         """
@@ -151,17 +297,75 @@ class AccountService(AbstractService):
         transactions = list(transactions)  # Ensure transactions is a list
         logger.info("Transactions retrieved successfully", count=len(transactions))
 
+        # Rows come straight from the database, so validation is skipped.
         return [
-            Transaction(
+            Transaction.model_construct(
                 id=transaction.id,
                 account_id=transaction.account_id,
                 amount=abs(transaction.amount),
                 description=transaction.description,
                 direction="withdraw" if transaction.amount < 0 else "deposit",
+                created_at=transaction.created_at,
             )
             for transaction in transactions
         ]
 
+    async def get_statement(
+        self, user_id: int, from_day: date, to_day: date
+    ) -> Statement:
+        """
+        Build a statement of daily deposit and withdrawal totals for a period.
+        Reads only the daily rollups, so the cost grows with the number of days,
+        not with the number of transactions.
+        :param user_id: The ID of the user whose statement is to be built.
+        :param from_day: First day of the period (UTC), inclusive.
+        :param to_day: Last day of the period (UTC), inclusive.
+        :return: Statement for the specified user and period.
+        """
+        logger = self.logger.bind(
+            user_id=user_id, from_day=from_day, to_day=to_day, action="get_statement"
+        )
+
+        if from_day > to_day:
+            logger.error("Statement period is empty")
+            raise HTTPException(
+                status_code=400, detail="'from' must not be after 'to'"
+            )
+
+        await get_account(self.uow, user_id, logger)
+
+        opening_balance = await self.uow.account_repo.get_balance_before(
+            user_id, from_day
+        )
+        rollups = await self.uow.account_repo.get_daily_rollups(
+            user_id, from_day, to_day
+        )
+        logger.info("Daily rollups retrieved", days=len(rollups))
+
+        days = [
+            DailyTotals(
+                day=rollup.day,
+                deposits=rollup.deposits_total,
+                deposits_count=rollup.deposits_count,
+                withdrawals=rollup.withdrawals_total,
+                withdrawals_count=rollup.withdrawals_count,
+            )
+            for rollup in rollups
+        ]
+        deposits = sum((day.deposits for day in days), Decimal(0))
+        withdrawals = sum((day.withdrawals for day in days), Decimal(0))
+
+        return Statement(
+            user_id=user_id,
+            from_day=from_day,
+            to_day=to_day,
+            opening_balance=opening_balance,
+            closing_balance=opening_balance + deposits - withdrawals,
+            deposits=deposits,
+            withdrawals=withdrawals,
+            days=days,
+        )
+
     async def create_account(self, user_id: int) -> Account:
         """
         Create a new account for the user if it does not already exist.
@@ -1,11 +1,11 @@
-from abc import ABC, abstractmethod
+from abc import ABC
 from dataclasses import dataclass
 
 from payments.uow import UOW
 from structlog import BoundLogger
 
 
-@dataclass
+@dataclass(slots=True)
 class AbstractService(ABC):
     """
     Abstract base class for services in the payments module.
@@ -14,6 +14,3 @@ class AbstractService(ABC):
 
     uow: UOW
     logger: BoundLogger
-
-    def __post_init__(self):
-        self.logger = self.logger.bind(service=self.__class__.__name__)
@@ -1,12 +1,45 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from structlog import BoundLogger
 
 from payments.repositories.account import AccountRepository
 
 
 class UOW:
-    def __init__(self, session: AsyncSession, logger: BoundLogger) -> None:
-        self.session = session
-        self.logger = logger.bind(unit_of_work=self.__class__.__name__)
+    """
+    Unit of Work for a single request.
+    The session and the repositories are created on first use, so requests
+    that never reach the database do not pay for them. The session itself only
+    checks out a connection when the first query is executed.
+    """
 
-        self.account_repo = AccountRepository(session=session, logger=self.logger)
+    __slots__ = ("logger", "_session_maker", "_session", "_account_repo")
+
+    def __init__(
+        self, session_maker: async_sessionmaker[AsyncSession], logger: BoundLogger
+    ) -> None:
+        self.logger = logger
+        self._session_maker = session_maker
+        self._session: AsyncSession | None = None
+        self._account_repo: AccountRepository | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_maker()
+        return self._session
+
+    @property
+    def account_repo(self) -> AccountRepository:
+        if self._account_repo is None:
+            self._account_repo = AccountRepository(
+                session=self.session, logger=self.logger
+            )
+        return self._account_repo
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()